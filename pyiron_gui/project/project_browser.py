@@ -1,24 +1,30 @@
 # coding: utf-8
 # Copyright (c) Max-Planck-Institut für Eisenforschung GmbH - Computational Materials Design (CM) Department
 # Distributed under the terms of "New BSD License", see the LICENSE file.
+import asyncio
+import html
+import io
 import os
 import posixpath
+import re
+import sys
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import partial, singledispatch
+from itertools import accumulate, chain, islice
 
 import ipywidgets as widgets
-import matplotlib.pyplot as plt
-import nbconvert
-import nbformat
+from ipywidgets import Button, ButtonStyle, HBox, Layout, VBox
 import numpy as np
-import pandas
 from IPython.core.display import display, HTML
 from traitlets import TraitError
 
 from pyiron_base import Project as BaseProject
-from pyiron_base import HasGroups
+from pyiron_base import GenericJob, HasGroups
 from pyiron_base.storage.filedata import FileData
 from pyiron_gui.widgets.widgets import WrapingHBox
 from pyiron_gui.wrapper.widgets import ObjectWidget, NumpyWidget
-from pyiron_gui.wrapper.wrapper import PyironWrapper, BaseWrapper
+from pyiron_gui.wrapper.wrapper import PyironWrapper, BaseWrapper, has_wrapper
 from pyiron_gui.utils.decorators import busy_check, clickable
 
 __author__ = "Niklas Siemer"
@@ -32,15 +38,113 @@ __email__ = "siemer@mpie.de"
 __status__ = "development"
 __date__ = "Feb 02, 2021"
 
+_NODE_FILTER = frozenset(("NAME", "TYPE", "VERSION", "HDF_VERSION"))
+_FILE_EXT_FILTER = (".h5", ".db")
+_HTML_EXPORTER = None
+_MAX_OUTPUT_LENGTH = (
+    2000  # performance of the output widget is extremely poor for longer outputs
+)
+_MAX_OUTPUT_CHARS = 1000000
+
+
+def _get_html_exporter():
+    """Return the (lazily created) exporter used to render notebooks; loading its template is expensive."""
+    global _HTML_EXPORTER
+    if _HTML_EXPORTER is None:
+        import nbconvert
+
+        _HTML_EXPORTER = nbconvert.HTMLExporter(template_name="classic")
+    return _HTML_EXPORTER
+
+
+def _isinstance_of_loaded(obj, module_name, class_name):
+    """isinstance check against module_name.class_name which does not import the module.
+
+    If the module is not imported yet, there cannot be an instance of its class."""
+    module = sys.modules.get(module_name)
+    return module is not None and isinstance(obj, getattr(module, class_name))
+
+
+def _notebook_output(obj):
+    html_output, _ = _get_html_exporter().from_notebook_node(obj)
+    return HTML(html_output)
+
+
+def _dict_output(obj):
+    if len(obj) <= _MAX_OUTPUT_LENGTH:
+        rows = "".join(
+            f"<tr><td>{html.escape(str(key))}</td><td>{html.escape(str(value))}</td></tr>"
+            for key, value in obj.items()
+        )
+        return HTML(f"<table>{rows}</table>")
+    # pandas truncates the output of large tables
+    import pandas
+
+    dic = {"": list(obj.keys()), " ": list(obj.values())}
+    return pandas.DataFrame(dic)
+
+
+def _list_output(obj):
+    if not all(isinstance(el, str) for el in islice(obj, _MAX_OUTPUT_LENGTH)):
+        import pandas
+
+        return pandas.DataFrame(obj, columns=["list"])
+    text = io.StringIO()
+    truncated = len(obj) >= _MAX_OUTPUT_LENGTH
+    for line in islice(obj, _MAX_OUTPUT_LENGTH):
+        remaining = _MAX_OUTPUT_CHARS - text.tell()
+        text.write(line[:remaining])
+        if len(line) > remaining:
+            truncated = True
+            break
+    if truncated:
+        text.write(os.linesep + " .... file too long: skipped ....")
+    return text.getvalue()
+
+
+def _image_output(obj):
+    try:
+        data_cp = obj.copy()
+        data_cp.thumbnail((800, 800))
+        data_cp = data_cp.convert("RGB")
+    except:
+        data_cp = obj
+    return data_cp
+
+
+@singledispatch
+def _convert_output(obj):
+    """Convert obj into a representation which can be displayed in the output widget."""
+    if _isinstance_of_loaded(obj, "PIL.Image", "Image"):
+        return _image_output(obj)
+    return obj
+
+
+@_convert_output.register(dict)
+def _(obj):
+    # nbformat is imported lazily, thus NotebookNode (a dict) cannot be registered in advance.
+    if _isinstance_of_loaded(obj, "nbformat.notebooknode", "NotebookNode"):
+        return _notebook_output(obj)
+    return _dict_output(obj)
+
+
+_convert_output.register(FileData, lambda obj: obj.data)
+_convert_output.register(str, lambda obj: obj)
+_convert_output.register(int, str)
+_convert_output.register(float, str)
+_convert_output.register(list, _list_output)
+
 
 class DisplayOutputGUI:
     """Display various kind of data in an appealing way using a ipywidgets.Output inside an ipywidgets.Vbox
     The behavior is very similar to standard ipywidgets.Output except one has to pass cls.box to get a display.
     """
 
+    __slots__ = ("box", "output", "_display_obj", "_debug")
+
     def __init__(self, *args, **kwargs):
-        self.box = widgets.VBox(*args, **kwargs)
-        self.output = widgets.Output(layout=widgets.Layout(width="99%"))
+        self.box = VBox(*args, **kwargs)
+        self.output = widgets.Output(layout=Layout(width="99%"))
         self._display_obj = None
         self._debug = False
         self.refresh()
@@ -59,8 +163,19 @@ class DisplayOutputGUI:
 
     def __getattr__(self, item):
         """Forward unknown attributes to the widgets.Output widget"""
+        if item == "output":
+            raise AttributeError(item)  # not yet set, e.g. during copying
         return self.output.__getattribute__(item)
 
+    def append_stdout(self, text):
+        self.output.append_stdout(text)
+
+    def append_stderr(self, text):
+        self.output.append_stderr(text)
+
+    def append_display_data(self, display_object):
+        self.output.append_display_data(display_object)
+
     def clear_output(self, *args, **kwargs):
         self.output.clear_output(*args, **kwargs)
         self.refresh()
@@ -68,7 +183,7 @@ class DisplayOutputGUI:
     def display(self, obj, default_output=None):
         if isinstance(obj, BaseWrapper):
             self.display(obj.gui, default_output=default_output)
-        elif isinstance(obj, tuple(PyironWrapper.registry.keys())[1:]):
+        elif has_wrapper(obj):
             self.display(PyironWrapper(obj, project=None))
         elif isinstance(obj, np.ndarray):
             self.display(NumpyWidget(obj), default_output=default_output)
@@ -88,58 +203,27 @@ class DisplayOutputGUI:
                 elif self._display_obj is None:
                     print(default_output)
                 else:
-                    plt.ioff()
+                    import matplotlib.pyplot as plt
+
+                    if plt.isinteractive():
+                        plt.ioff()
                     display(self._output_conv())
 
     def _output_conv(self):
         obj = self._display_obj
 
-        eol = os.linesep
         if self._debug:
             print("node: ", type(obj))
 
         if hasattr(obj, "_repr_html_"):
             return obj  # ._repr_html_()
-        elif isinstance(obj, FileData):
-            return obj.data
-        elif isinstance(obj, str):
-            return obj
-        elif isinstance(obj, nbformat.notebooknode.NotebookNode):
-            html_exporter = nbconvert.HTMLExporter()
-            # html_exporter.template_name = "basic"
-            html_exporter.template_name = "classic"
-            (html_output, resources) = html_exporter.from_notebook_node(obj)
-            return HTML(html_output)
-        elif isinstance(obj, dict):
-            dic = {"": list(obj.keys()), " ": list(obj.values())}
-            return pandas.DataFrame(dic)
-        elif isinstance(obj, (int, float)):
-            return str(obj)
-        elif isinstance(obj, list) and all([isinstance(el, str) for el in obj]):
-            max_length = 2000  # performance of widget above is extremely poor
-            if len(obj) < max_length:
-                return str("".join(obj))
-            else:
-                return str(
-                    "".join(obj[:max_length])
-                    + eol
-                    + " .... file too long: skipped ...."
-                )
-        elif isinstance(obj, list):
-            return pandas.DataFrame(obj, columns=["list"])
-        elif str(type(obj)).split(".")[0] == "<class 'PIL":
-            try:
-                data_cp = obj.copy()
-                data_cp.thumbnail((800, 800))
-                data_cp = data_cp.convert("RGB")
-            except:
-                data_cp = obj
-            return data_cp
-        else:
-            return obj
+        return _convert_output(obj)
 
 
 class ColorScheme:
+    # Hex colors (#rgb, #rgba, #rrggbb, #rrggbbaa) are accepted without the slower traitlet validation
+    _HEX_COLOR_RE = re.compile(r"#(?:[0-9a-fA-F]{3,4}|[0-9a-fA-F]{6}|[0-9a-fA-F]{8})")
+
     def __init__(self, color_dict=None):
         self._color_traitlet = widgets.Color(None, allow_none=False)
         self._color_dict = {}
@@ -168,6 +252,8 @@ class ColorScheme:
                 raise ValueError(f"No valid key '{key}'")
 
     def _validate_color(self, color):
+        if isinstance(color, str) and self._HEX_COLOR_RE.fullmatch(color):
+            return color
         try:
             self._color_traitlet.validate(None, color)
         except TraitError as e:
@@ -201,16 +287,20 @@ class HasGroupsBrowser(HasGroups):
     Methods:
         gui: Returns the Box in which the Browser is displayed
         refresh: Refresh all widgets.
+        invalidate: Reload groups, nodes and files of the current project on next access.
     """
 
     def __init__(self, project, box=None):
         if box is None or box == "VBox":
-            self._box = widgets.VBox()
+            self._box = VBox()
         elif box == "HBox":
-            self._box = widgets.HBox()
+            self._box = HBox()
         else:
             self._box = box
-        self._body_box = widgets.VBox(layout=widgets.Layout(width="100%"))
+        self._body_box = VBox(layout=Layout(width="100%"))
+        self._control_box = HBox()
+        self._group_box = WrapingHBox()
+        self._node_box = WrapingHBox()
 
         if not isinstance(project, HasGroups):
             raise TypeError()
@@ -219,13 +309,29 @@ class HasGroupsBrowser(HasGroups):
         self._history = [project]
         self._history_idx = 0
         self._clicked_nodes = []
-
-        self._file_ext_filter = [".h5", ".db"]
-        self._node_filter = ["NAME", "TYPE", "VERSION", "HDF_VERSION"]
+        self._refresh_depth = 0
+        self._refresh_pending = False
+        # Parts of the browser besides the body which have to be rebuilt on the next refresh
+        self._dirty = {"options": True, "path": True}
+        self._listing_cache = OrderedDict()
+        self._listing_cache_size = 32
+        self._refresh_listing = None
+        self._group_button_pool = []
+        self._node_button_pool = []
+        self._page_size = 200
+        self._n_shown = self._page_size
+        self._pending_navigation = None
+        self._navigation_scheduled = False
+        self._button_styles = {}
+        self._node_buttons = {}
+        self._show_more_buttons = {}
+
+        self._file_ext_filter = _FILE_EXT_FILTER
+        self._node_filter = _NODE_FILTER
         self._show_all = False
         self._show_files = True
         self._fix_position = False
-        self._item_layout = widgets.Layout(
+        self._item_layout = Layout(
             width="min-content",
             height="30px",
             min_height="24px",
@@ -234,7 +340,7 @@ class HasGroupsBrowser(HasGroups):
             justify_content="flex-start",
         )
         self._control_layout = self._item_layout
-        self._control_bar_layout = widgets.Layout(height="min-content")
+        self._control_bar_layout = Layout(height="min-content")
         self._color = ColorScheme(
             {
                 "control": "#FF0000",
@@ -271,7 +377,7 @@ class HasGroupsBrowser(HasGroups):
         return self.list_groups()
 
     def _list_groups(self):
-        return self.project.list_groups()
+        return self._cached_listing("groups")
 
     @property
     def nodes(self):
@@ -279,12 +385,13 @@ class HasGroupsBrowser(HasGroups):
 
     def _list_nodes(self):
         if self._show_all:
-            return self.project.list_nodes()
+            return self._cached_listing("nodes")
         else:
+            node_filter = self._node_filter
             return [
                 node
-                for node in self.project.list_nodes()
-                if node not in self._node_filter
+                for node in self._cached_listing("nodes")
+                if node not in node_filter
             ]
 
     @property
@@ -294,15 +401,54 @@ class HasGroupsBrowser(HasGroups):
     def _list_files(self):
         if hasattr(self.project, "list_files"):
             if self._show_all:
-                return self.project.list_files()
+                return self._cached_listing("files")
             elif self._node_as_group and self._show_files:
+                file_ext_filter = tuple(self._file_ext_filter)
                 return [
                     file
-                    for file in self.project.list_files()
-                    if not file.endswith(tuple(self._file_ext_filter))
+                    for file in self._cached_listing("files")
+                    if not file.endswith(file_ext_filter)
                 ]
         return []
 
+    @property
+    def _listing_cache_key(self):
+        """Key of the current project in the listing cache; None for projects without a path (e.g. in memory)."""
+        path = getattr(self.project, "path", None)
+        if path is None:
+            return None
+        return type(self.project), path
+
+    def _cached_listing(self, kind):
+        """Return a copy of self.project.list_<kind>(), cached for projects backed by a path."""
+        key = self._listing_cache_key
+        if key is None:
+            # Projects without a path are only listed once per refresh
+            if self._refresh_listing is None:
+                return list(getattr(self.project, "list_" + kind)())
+            listing = self._refresh_listing.setdefault(id(self.project), {})
+            if kind not in listing:
+                listing[kind] = getattr(self.project, "list_" + kind)()
+            return list(listing[kind])
+        listing = self._listing_cache.get(key)
+        if listing is None:
+            listing = self._store_listing(key, {})
+        else:
+            self._listing_cache.move_to_end(key)
+        if kind not in listing:
+            listing[kind] = getattr(self.project, "list_" + kind)()
+        return list(listing[kind])
+
+    def _store_listing(self, key, listing):
+        self._listing_cache[key] = listing
+        if len(self._listing_cache) > self._listing_cache_size:
+            self._listing_cache.popitem(last=False)
+        return listing
+
+    def invalidate(self):
+        """Drop the cached groups/nodes/files of the current project such that they are reloaded on next access."""
+        self._listing_cache.pop(self._listing_cache_key, None)
+
     @property
     def project(self):
         return self._project
@@ -315,14 +461,15 @@ class HasGroupsBrowser(HasGroups):
             raise TypeError
         self._set_project(new_project)
         self._history_idx += 1
-        self._history = self._history[: self._history_idx]
+        del self._history[self._history_idx :]
         self._history.append(self.project)
-        self.refresh()
+        self._refresh_all()
 
     def _set_project(self, new_project):
         self._project = new_project
         self._data = None
         self._clicked_nodes = []
+        self._n_shown = self._page_size
 
     @property
     def _node_as_group(self):
@@ -336,7 +483,7 @@ class HasGroupsBrowser(HasGroups):
         if hist_idx is not None:
             self._history_idx = hist_idx
         self._set_project(self._history[self._history_idx])
-        self.refresh()
+        self._refresh_all()
 
     @clickable
     def _go_back(self):
@@ -350,26 +497,54 @@ class HasGroupsBrowser(HasGroups):
 
     @clickable
     def _click_refresh(self):
-        self.refresh()
+        self.invalidate()
+        self._refresh()
+
+    def _schedule_navigation(self, navigate):
+        """Call navigate() once the kernel is idle; a scheduled navigation which did not run yet is replaced.
+
+        Without a running event loop (e.g. outside a kernel) navigate() is called immediately.
+        """
+        self._pending_navigation = navigate
+        if self._navigation_scheduled:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._run_pending_navigation()
+            return
+        self._navigation_scheduled = True
+        loop.call_soon(self._run_pending_navigation)
+
+    def _run_pending_navigation(self):
+        self._navigation_scheduled = False
+        navigate, self._pending_navigation = self._pending_navigation, None
+        if navigate is not None:
+            busy_check()(navigate)()
 
     def _gen_control_buttons(self, layout=None):
         if layout is None:
             layout = self._control_layout
-        back_button = widgets.Button(description="", icon="arrow-left", layout=layout)
-        back_button.style.button_color = self.color["control"]
+        control_style = self._button_style(self.color["control"])
+        back_button = Button(
+            description="",
+            icon="arrow-left",
+            layout=layout,
+            style=control_style,
+            disabled=self._history_idx == 0,
+        )
         back_button.on_click(self._go_back)
-        if self._history_idx == 0:
-            back_button.disabled = True
 
-        forward_button = widgets.Button(
-            description="", icon="arrow-right", layout=layout
+        forward_button = Button(
+            description="",
+            icon="arrow-right",
+            layout=layout,
+            style=control_style,
+            disabled=self._history_idx == len(self._history) - 1,
         )
-        forward_button.style.button_color = self.color["control"]
         forward_button.on_click(self._go_forward)
-        if self._history_idx == len(self._history) - 1:
-            forward_button.disabled = True
 
-        refresh_button = widgets.Button(description="", icon="refresh", layout=layout)
+        refresh_button = Button(description="", icon="refresh", layout=layout)
         refresh_button.on_click(self._click_refresh)
 
         return [back_button, forward_button, refresh_button]
@@ -381,25 +556,93 @@ class HasGroupsBrowser(HasGroups):
     def _on_click_group(self, b):
         self._update_project(b.description)
 
+    def _button_style(self, color):
+        """ButtonStyle with the given color, shared by all buttons of this browser using that color."""
+        style = self._button_styles.get(color)
+        if style is None:
+            style = self._button_styles[color] = ButtonStyle(button_color=color)
+        return style
+
+    def _pooled_buttons(
+        self, pool, descriptions, styles, icon, on_click, disabled=False
+    ):
+        """Return one button of the pool per description.
+
+        Reused buttons only get their traits updated, missing ones are created with their final traits.
+        """
+        n_pooled = len(pool)
+        for button, description, style in zip(pool, descriptions, styles):
+            with button.hold_sync():
+                button.description = description
+                button.style = style
+                button.disabled = disabled
+        for description, style in zip(descriptions[n_pooled:], styles[n_pooled:]):
+            button = Button(
+                description=description,
+                icon=icon,
+                style=style,
+                disabled=disabled,
+                layout=self._item_layout,
+            )
+            button.on_click(on_click)
+            pool.append(button)
+        return pool[: len(descriptions)]
+
+    @busy_check()
+    @clickable
+    def _show_more(self):
+        self._n_shown += self._page_size
+        self._update_body_box()
+
+    def _limit_shown(self, *listings):
+        """Return the items of the listings to show (at most self._n_shown) and whether some were left out."""
+        n_shown = self._n_shown
+        items = list(islice(chain(*listings), n_shown))
+        return items, sum(len(listing) for listing in listings) > n_shown
+
+    def _gen_show_more_button(self, kind):
+        button = self._show_more_buttons.get(kind)
+        if button is None:
+            button = self._show_more_buttons[kind] = Button(
+                description="Show more", icon="ellipsis-h", layout=self._item_layout
+            )
+            button.on_click(self._show_more)
+        button.tooltip = f"Show up to {self._page_size} more {kind}"
+        return button
+
     def _gen_group_buttons(self, groups=None):
+        truncated = False
         if groups is None:
-            groups = self.groups + self.nodes if self._node_as_group else self.groups
-        button_list = []
-        for group in groups:
-            button = widgets.Button(
-                description=str(group), icon="folder", layout=self._item_layout
-            )
-            button.style.button_color = self.color["group"]
-            button.on_click(self._on_click_group)
-            if self._fix_position:
-                button.disabled = True
-            button_list.append(button)
+            if self._node_as_group:
+                groups, truncated = self._limit_shown(self.groups, self.nodes)
+            else:
+                groups, truncated = self._limit_shown(self.groups)
+        button_list = self._pooled_buttons(
+            self._group_button_pool,
+            [str(group) for group in groups],
+            [self._button_style(self.color["group"])] * len(groups),
+            "folder",
+            self._on_click_group,
+            disabled=self._fix_position,
+        )
+        if truncated:
+            button_list.append(self._gen_show_more_button("groups"))
         return button_list
 
     @busy_check()
     def _on_click_node(self, b):
+        previously_clicked = list(self._clicked_nodes)
         self._select_node(b.description)
-        self._update_body_box()
+        self._update_node_button_colors(previously_clicked)
+
+    def _update_node_button_colors(self, previously_clicked):
+        """Recolor the displayed node buttons whose selection state changed."""
+        clicked_nodes = frozenset(self._clicked_nodes)
+        for node in clicked_nodes.symmetric_difference(previously_clicked):
+            button = self._node_buttons.get(node)
+            if button is not None:
+                color = "file_chosen" if node in clicked_nodes else "file"
+                button.style = self._button_style(self.color[color])
 
     def _select_node(self, node):
         if node in self._clicked_nodes:
@@ -414,43 +657,86 @@ class HasGroupsBrowser(HasGroups):
                 self._data = None
 
     def _gen_node_buttons(self, nodes=None):
+        truncated = False
         if nodes is None:
-            nodes = self.files if self._node_as_group else self.files + self.nodes
-        node_list = []
-        for node in nodes:
-            button = widgets.Button(
-                description=str(node), icon="file-o", layout=self._item_layout
-            )
-            if node in self._clicked_nodes:
-                button.style.button_color = self.color["file_chosen"]
+            if self._node_as_group:
+                nodes, truncated = self._limit_shown(self.files)
             else:
-                button.style.button_color = self.color["file"]
-            button.on_click(self._on_click_node)
-            node_list.append(button)
+                nodes, truncated = self._limit_shown(self.files, self.nodes)
+        clicked_nodes = frozenset(self._clicked_nodes)
+        chosen_style = self._button_style(self.color["file_chosen"])
+        style = self._button_style(self.color["file"])
+        node_list = self._pooled_buttons(
+            self._node_button_pool,
+            [str(node) for node in nodes],
+            [chosen_style if node in clicked_nodes else style for node in nodes],
+            "file-o",
+            self._on_click_node,
+        )
+        self._node_buttons = dict(zip(nodes, node_list))
+        if truncated:
+            node_list.append(self._gen_show_more_button("nodes"))
         return node_list
 
     def _update_body_box(self, body_box=None):
         if body_box is None:
             body_box = self._body_box
+        self._update_group_and_node_boxes()
         if self._fix_position:
-            body_box.children = [
-                WrapingHBox(self._gen_group_buttons()),
-                WrapingHBox(self._gen_node_buttons()),
-            ]
+            body_box.children = (self._group_box, self._node_box)
         else:
-            body_box.children = [
-                widgets.HBox(self._gen_control_buttons()),
-                WrapingHBox(self._gen_group_buttons()),
-                WrapingHBox(self._gen_node_buttons()),
-            ]
+            self._control_box.children = tuple(self._gen_control_buttons())
+            body_box.children = (self._control_box, self._group_box, self._node_box)
+
+    def _update_group_and_node_boxes(self):
+        # The boxes and the pooled buttons are reused, such that an unchanged listing assigns identical children
+        # which traitlets does not send to the frontend.
+        self._group_box.children = tuple(self._gen_group_buttons())
+        self._node_box.children = tuple(self._gen_node_buttons())
 
     def _gen_box_children(self):
         self._update_body_box()
         return [self._body_box]
 
+    @contextmanager
+    def _batch_refresh(self):
+        """Collapse all refresh() calls issued inside the context into a single refresh on exit."""
+        self._refresh_depth += 1
+        try:
+            yield
+        finally:
+            self._refresh_depth -= 1
+        if self._refresh_depth == 0 and self._refresh_pending:
+            self._refresh()
+
+    def _mark_dirty(self, *parts):
+        """Mark the given parts (all if none given) to be rebuilt on the next refresh; the body always is."""
+        for part in parts or tuple(self._dirty):
+            self._dirty[part] = True
+
     def refresh(self):
-        """Refresh the project browser."""
-        self._box.children = tuple(self._gen_box_children())
+        """Refresh the project browser; the groups, nodes and files of the current project are reloaded."""
+        self.invalidate()
+        self._refresh_all()
+
+    def _refresh_all(self):
+        """Rebuild all parts of the browser; cached listings are reused."""
+        self._mark_dirty()
+        self._refresh()
+
+    def _refresh(self):
+        """Rebuild the body and the parts marked as dirty."""
+        if self._refresh_depth > 0:
+            self._refresh_pending = True
+            return
+        self._refresh_pending = False
+        self._refresh_listing = {}
+        try:
+            with self._box.hold_sync():
+                self._box.children = tuple(self._gen_box_children())
+        finally:
+            self._refresh_listing = None
+        self._dirty = dict.fromkeys(self._dirty, False)
 
     def gui(self):
         """Return the VBox containing the browser."""
@@ -470,9 +756,7 @@ class HasGroupsBrowserWithHistoryPath(HasGroupsBrowser):
     """
 
     def __init__(self, project, box=None):
-        self._pathbox = widgets.HBox(
-            layout=widgets.Layout(width="100%", justify_content="flex-start")
-        )
+        self._pathbox = HBox(layout=Layout(width="100%", justify_content="flex-start"))
         super().__init__(project=project, box=box)
         self._color.add_colors({"path": "#DDDDAA", "home": "#999999"})
         self._path_list = ["/"]
@@ -488,46 +772,54 @@ class HasGroupsBrowserWithHistoryPath(HasGroupsBrowser):
         if not isinstance(new_project, HasGroups):
             raise TypeError
         self._project = new_project
+        self._n_shown = self._page_size
         self._history_idx += 1
-        self._history = self._history[: self._history_idx]
-        self._path_list = self._path_list[: self._history_idx]
+        del self._history[self._history_idx :]
+        del self._path_list[self._history_idx :]
         self._history.append(self.project)
-        self.refresh()
+        self._refresh_all()
 
     def _update_project(self, group_name):
-        super()._update_project(group_name)
-        self._path_list.append(group_name)
-        self.refresh()
+        with self._batch_refresh():
+            super()._update_project(group_name)
+            self._path_list.append(group_name)
+            self._refresh_all()
 
     @property
     def path_list(self):
         return self._path_list[: self._history_idx + 1]
 
-    def _update_pathbox(self, box=None):
-        @busy_check()
-        def on_click(b):
-            self._load_history(b.idx)
+    def _on_click_path_button(self, b):
+        self._schedule_navigation(partial(self._load_history, b.idx))
 
+    def _update_pathbox(self, box=None):
         if box is None:
             box = self._pathbox
 
         # Home button
-        button = widgets.Button(icon="home", tooltip="/", layout=self._control_layout)
-        button.style.button_color = self.color["home"]
+        button = Button(
+            icon="home",
+            tooltip="/",
+            layout=self._control_layout,
+            style=self._button_style(self.color["home"]),
+        )
         button.idx = 0
-        button.on_click(on_click)
+        button.on_click(self._on_click_path_button)
 
         buttons = [button]
         # Path buttons
+        path_style = self._button_style(self.color["path"])
         for idx, path in enumerate(self.path_list):
             if idx == 0:
                 continue
-            button = widgets.Button(
-                description=path + "/", tooltip=path, layout=self._control_layout
+            button = Button(
+                description=path + "/",
+                tooltip=path,
+                layout=self._control_layout,
+                style=path_style,
             )
-            button.style.button_color = self.color["path"]
             button.idx = idx
-            button.on_click(on_click)
+            button.on_click(self._on_click_path_button)
             buttons.append(button)
 
         box.children = tuple(buttons)
@@ -535,32 +827,30 @@ class HasGroupsBrowserWithHistoryPath(HasGroupsBrowser):
     def _update_body_box(self, body_box=None):
         if body_box is None:
             body_box = self._body_box
-        body_box.children = [
-            WrapingHBox(self._gen_group_buttons()),
-            WrapingHBox(self._gen_node_buttons()),
-        ]
+        self._update_group_and_node_boxes()
+        body_box.children = (self._group_box, self._node_box)
 
     def _gen_box_children(self):
         box_children = super()._gen_box_children()
         self._update_pathbox(self._pathbox)
-        return [
-            widgets.HBox(self._gen_control_buttons() + [self._pathbox])
-        ] + box_children
+        return [HBox(self._gen_control_buttons() + [self._pathbox])] + box_children
 
 
 class HasGroupBrowserWithOutput(HasGroupsBrowser):
     """Extends the :class:.HasGroupsBrowser with an output window to display the currently clicked node."""
 
     def __init__(self, project, box=None):
-        self._output = DisplayOutputGUI(
-            layout=widgets.Layout(width="50%", height="100%")
-        )
+        self._output = DisplayOutputGUI(layout=Layout(width="50%", height="100%"))
         super().__init__(project=project, box=box)
-        self._body_box = widgets.VBox(
-            layout=widgets.Layout(
-                width="50%", height="100%", justify_content="flex-start"
-            )
+        self._body_box = VBox(
+            layout=Layout(width="50%", height="100%", justify_content="flex-start")
         )
+        self._body_output_box = HBox(
+            [self._body_box, self._output.box],
+            layout=Layout(min_height="100px", max_height="800px"),
+        )
+        self._object_cache = OrderedDict()
+        self._object_cache_size = 8
 
     def _clear_output(self):
         self._output.clear_output(True)
@@ -572,18 +862,14 @@ class HasGroupBrowserWithOutput(HasGroupsBrowser):
             self._output.display(self.project)
 
         self._update_body_box(self._body_box)
-        body = widgets.HBox(
-            [self._body_box, self._output.box],
-            layout=widgets.Layout(min_height="100px", max_height="800px"),
-        )
-        return [body]
+        return [self._body_output_box]
 
     def _update_project_worker(self, rel_path):
         new_project = self.project[rel_path]
         if "TYPE" in new_project.list_nodes():
             try:
                 new_project2 = PyironWrapper(
-                    new_project.to_object(), self.project, rel_path
+                    self._to_object(new_project), self.project, rel_path
                 )
             except (
                 ValueError
@@ -594,13 +880,39 @@ class HasGroupBrowserWithOutput(HasGroupsBrowser):
                 self._output.display(new_project)
         self.project = new_project
 
+    def _to_object(self, hdf):
+        """Return hdf.to_object(), reusing the object if the HDF5 group was loaded before and the file is unchanged.
+
+        Jobs are always loaded anew, since they are commonly modified and their state is not only kept in the file.
+        """
+        try:
+            key = (hdf.file_name, hdf.h5_path, os.stat(hdf.file_name).st_mtime_ns)
+        except (AttributeError, OSError, TypeError):
+            return hdf.to_object()
+        obj = self._object_cache.get(key)
+        if obj is None:
+            obj = hdf.to_object()
+            if isinstance(obj, GenericJob):
+                return obj
+            self._object_cache[key] = obj
+            if len(self._object_cache) > self._object_cache_size:
+                self._object_cache.popitem(last=False)
+        else:
+            self._object_cache.move_to_end(key)
+        return obj
+
     def _update_project(self, group_name):
         self._clear_output()
         self._update_project_worker(group_name)
 
     def _select_node(self, node):
-        self._clear_output()
+        if node not in self._clicked_nodes:
+            # The output widget is updated right away, thus the message is visible while the node is read.
+            self._output.clear_output(True)
+            with self._output:
+                print(f"Loading {node} ...")
         super()._select_node(node)
+        self._clear_output()
         if node in self._clicked_nodes:
             self._output.display(self.data, default_output=[node])
 
@@ -623,22 +935,14 @@ class ProjectBrowser(HasGroupBrowserWithOutput):
             fix_path (bool): If True the path in the file system cannot be changed.
             show_files(bool): If True files (from project.list_files()) are displayed.
         """
-        min_control_bar_height = "35px"
-        self.pathbox = widgets.HBox(
-            layout=widgets.Layout(
-                width="100%",
-                min_height=min_control_bar_height,
-                justify_content="flex-start",
-            )
-        )
-        self.optionbox = widgets.HBox(
-            layout=widgets.Layout(min_height=min_control_bar_height)
-        )
-        self.path_string_box = widgets.Text(
-            description="(rel) Path", layout=widgets.Layout(width="min-content")
-        )
+        self._widgets_built = False
+        self._path_button_layout = Layout(width="auto")
+        self._pathbox_paths = []
+        self._pathbox_buttons = []
+        self._root_path_cache = (None, None)
+        self._pathbox_cache = {}
         super().__init__(project=project, box=Vbox)
-        self._item_layout = widgets.Layout(
+        self._item_layout = Layout(
             width="80%",
             height="30px",
             min_height="24px",
@@ -653,6 +957,64 @@ class ProjectBrowser(HasGroupBrowserWithOutput):
         self._fix_position = fix_path
         self._hide_path = True
 
+    def _ensure_widgets(self):
+        """Construct the option and path widgets on first use, i.e. not before the browser is shown."""
+        if self._widgets_built:
+            return
+        min_control_bar_height = "35px"
+        self._pathbox = HBox(
+            layout=Layout(
+                width="100%",
+                min_height=min_control_bar_height,
+                justify_content="flex-start",
+            )
+        )
+        self._optionbox = HBox(layout=Layout(min_height=min_control_bar_height))
+        self._path_string_box = widgets.Text(
+            description="(rel) Path", layout=Layout(width="min-content")
+        )
+        self._set_path_button = Button(
+            description="Set Path", tooltip="Sets current path to provided string."
+        )
+        self._set_path_button.on_click(self._set_pathbox_path)
+        self._reset_selection_button = Button(
+            description="Reset selection", layout=Layout(width="min-content")
+        )
+        self._reset_selection_button.on_click(self._reset_data)
+        self._home_button = Button(icon="home", layout=self._path_button_layout)
+        self._home_button.on_click(self._on_click_path_button)
+        self._widgets_built = True
+
+    @property
+    def pathbox(self):
+        self._ensure_widgets()
+        return self._pathbox
+
+    @pathbox.setter
+    def pathbox(self, widget):
+        self._ensure_widgets()
+        self._pathbox = widget
+
+    @property
+    def optionbox(self):
+        self._ensure_widgets()
+        return self._optionbox
+
+    @optionbox.setter
+    def optionbox(self, widget):
+        self._ensure_widgets()
+        self._optionbox = widget
+
+    @property
+    def path_string_box(self):
+        self._ensure_widgets()
+        return self._path_string_box
+
+    @path_string_box.setter
+    def path_string_box(self, widget):
+        self._ensure_widgets()
+        self._path_string_box = widget
+
     @property
     def _initial_project(self):
         return self._history[0]
@@ -675,7 +1037,7 @@ class ProjectBrowser(HasGroupBrowserWithOutput):
     @box.setter
     def box(self, Vbox):
         self._box = Vbox
-        self.refresh()
+        self._refresh_all()
 
     @property
     def fix_path(self):
@@ -684,7 +1046,7 @@ class ProjectBrowser(HasGroupBrowserWithOutput):
     @fix_path.setter
     def fix_path(self, fix_path):
         self._fix_position = fix_path
-        self.refresh()
+        self._refresh_all()
 
     @property
     def show_files(self):
@@ -693,7 +1055,7 @@ class ProjectBrowser(HasGroupBrowserWithOutput):
     @show_files.setter
     def show_files(self, show_files):
         self._show_files = show_files
-        self.refresh()
+        self._refresh()
 
     @property
     def hide_path(self):
@@ -702,7 +1064,8 @@ class ProjectBrowser(HasGroupBrowserWithOutput):
     @hide_path.setter
     def hide_path(self, hide_path):
         self._hide_path = hide_path
-        self.refresh()
+        self._mark_dirty("path")
+        self._refresh()
 
     def __copy__(self):
         """Copy of the browser using a new Vbox."""
@@ -727,22 +1090,31 @@ class ProjectBrowser(HasGroupBrowserWithOutput):
 
     @property
     def _project_root_path(self):
+        project = self.project
+        cached_project, root_path = self._root_path_cache
+        if cached_project is not project:
+            root_path = self._lookup_root_path(project)
+            self._root_path_cache = (project, root_path)
+        return root_path
+
+    @staticmethod
+    def _lookup_root_path(project):
         try:
-            return self.project.root_path
+            return project.root_path
         except AttributeError:
             pass
         try:
-            return self.project.project.root_path
+            return project.project.root_path
         except AttributeError:
             return None
 
     def _gen_box_children(self):
         body = super()._gen_box_children()
-        self.path_string_box = self.path_string_box.__class__(
-            description="(rel) Path", value=""
-        )
-        self._update_optionbox(self.optionbox)
-        self._update_pathbox(self.pathbox)
+        if self._dirty["options"]:
+            self.path_string_box.value = ""
+            self._update_optionbox(self.optionbox)
+        if self._dirty["path"]:
+            self._update_pathbox(self.pathbox)
         return [self.optionbox, self.pathbox] + body
 
     def configure(self, Vbox=None, fix_path=None, show_files=None, hide_path=None):
@@ -755,35 +1127,29 @@ class ProjectBrowser(HasGroupBrowserWithOutput):
             show_files(bool/None): If True files (from project.list_files()) are displayed.
             hide_path(bool/None): If True the root_path is omitted in the path.
         """
-        if Vbox is not None:
-            self._box = Vbox
-        if fix_path is not None:
-            self._fix_position = fix_path
-        if show_files is not None:
-            self._show_files = show_files
-        if hide_path is not None:
-            self._hide_path = hide_path
-        self.refresh()
+        with self._batch_refresh():
+            if Vbox is not None:
+                self.box = Vbox
+            if fix_path is not None:
+                self.fix_path = fix_path
+            if show_files is not None:
+                self.show_files = show_files
+            if hide_path is not None:
+                self.hide_path = hide_path
+            self._refresh_all()
 
     def _update_optionbox(self, optionbox):
-        set_path_button = widgets.Button(
-            description="Set Path", tooltip="Sets current path to provided string."
-        )
-        set_path_button.on_click(self._set_pathbox_path)
+        self._ensure_widgets()
+        set_path_button = self._set_path_button
+        set_path_button.disabled = self.fix_path
         if self.fix_path:
-            set_path_button.disabled = True
             children = [set_path_button, self.path_string_box]
         else:
             children = self._gen_control_buttons() + [
                 set_path_button,
                 self.path_string_box,
             ]
-
-        button = widgets.Button(
-            description="Reset selection", layout=widgets.Layout(width="min-content")
-        )
-        button.on_click(self._reset_data)
-        children.append(button)
+        children.append(self._reset_selection_button)
 
         optionbox.children = tuple(children)
 
@@ -820,9 +1186,7 @@ class ProjectBrowser(HasGroupBrowserWithOutput):
         try:
             super(ProjectBrowser, self)._update_project_worker(rel_path)
         except (ValueError, AttributeError):
-            self.path_string_box = self.path_string_box.__class__(
-                description="(rel) Path", value=""
-            )
+            self.path_string_box.value = ""
             with self._output:
                 print("No valid path")
             return
@@ -832,73 +1196,91 @@ class ProjectBrowser(HasGroupBrowserWithOutput):
 
     def _update_project(self, path):
         self._clear_output()
-        if isinstance(path, str):
-            if os.path.isabs(path):
-                path = os.path.relpath(path, self.path)
-            if path == ".":
-                self.refresh()
-                return
-            self._update_project_worker(path)
-        else:
-            self.project = path
+        with self._batch_refresh():
+            if isinstance(path, str):
+                if os.path.isabs(path):
+                    path = self._abs_to_rel_path(path)
+                if path == ".":
+                    self._refresh()
+                    return
+                self._update_project_worker(path)
+            else:
+                self.project = path
+
+    def _abs_to_rel_path(self, path):
+        """Path relative to self.path; paths below self.path skip os.path.relpath."""
+        current = self.path.rstrip("/")
+        path = path.rstrip("/")
+        if path == current:
+            return "."
+        if path.startswith(current + "/"):
+            rel_path = path[len(current) + 1 :]
+            if all(part not in ("", ".", "..") for part in rel_path.split("/")):
+                return rel_path
+        return os.path.relpath(path, self.path)
 
     def _gen_pathbox_path_list(self):
         """Internal helper function to generate a list of paths from the current path."""
-        path_list = list()
-        tmppath = posixpath.abspath(self.path)
-        if tmppath[-1] == "/":
-            tmppath = tmppath[:-1]
-        tmppath_old = tmppath + "/"
-        while tmppath != tmppath_old:
-            tmppath_old = tmppath
-            [tmppath, _] = os.path.split(tmppath)
-            path_list.append(tmppath_old)
-        path_list.reverse()
-        return path_list
+        path = self.path
+        path_list = self._pathbox_cache.get(path)
+        if path_list is None:
+            parts = posixpath.abspath(path).rstrip("/").split("/")[1:]
+            path_list = ["/", *accumulate("/" + part for part in parts)]
+            if len(self._pathbox_cache) >= self._listing_cache_size:
+                self._pathbox_cache.clear()
+            self._pathbox_cache[path] = path_list
+        return list(path_list)
+
+    def _on_click_path_button(self, b):
+        self._schedule_navigation(partial(self._update_project, b.path))
+
+    def _gen_path_button(self, path):
+        current_dir = path[path.rfind("/") + 1 :]
+        button = Button(
+            description=current_dir + "/",
+            tooltip=current_dir,
+            layout=self._path_button_layout,
+            style=self._button_style(self.color["path"]),
+        )
+        button.path = path
+        button.on_click(self._on_click_path_button)
+        return button
 
     def _update_pathbox(self, box):
-        @busy_check()
-        def on_click(b):
-            self._update_project(b.path)
-
-        buttons = []
-        len_root_path = (
-            len(self._project_root_path[:-1])
-            if self._project_root_path is not None
-            else 0
-        )
+        self._ensure_widgets()
+        root_path = self._project_root_path
+        len_root_path = len(root_path) - 1 if root_path is not None else 0
 
         # Home button
-        button = widgets.Button(
-            icon="home",
-            tooltip=self._initial_project_path,
-            layout=widgets.Layout(width="auto"),
-        )
-        button.style.button_color = self.color["home"]
-        button.path = self._initial_project
-        if self.fix_path:
-            button.disabled = True
-        button.on_click(on_click)
-        buttons.append(button)
-
-        # Path buttons
-        for path in self._gen_pathbox_path_list():
-            _, current_dir = os.path.split(path)
-            button = widgets.Button(
-                description=current_dir + "/",
-                tooltip=current_dir,
-                layout=widgets.Layout(width="auto"),
-            )
-            button.style.button_color = self.color["path"]
-            button.path = path
-            button.on_click(on_click)
-            if self.fix_path or len(path) < len_root_path - 1:
-                button.disabled = True
-                if self._hide_path:
-                    button.layout.display = "none"
-            buttons.append(button)
-
-        box.children = tuple(buttons)
+        home_button = self._home_button
+        with home_button.hold_sync():
+            home_button.tooltip = self._initial_project_path
+            home_button.style = self._button_style(self.color["home"])
+            home_button.disabled = self.fix_path
+        home_button.path = self._initial_project
+
+        # Path buttons; the ones above the root path are left out if the path is hidden
+        path_list = self._gen_pathbox_path_list()
+        if self._hide_path:
+            path_list = [path for path in path_list if len(path) >= len_root_path - 1]
+        # Buttons of the common leading paths of the last update are reused
+        n_common = 0
+        for old_path, path in zip(self._pathbox_paths, path_list):
+            if old_path != path:
+                break
+            n_common += 1
+        path_buttons = self._pathbox_buttons[:n_common] + [
+            self._gen_path_button(path) for path in path_list[n_common:]
+        ]
+        path_style = self._button_style(self.color["path"])
+        for button, path in zip(path_buttons, path_list):
+            with button.hold_sync():
+                button.style = path_style
+                button.disabled = self.fix_path or len(path) < len_root_path - 1
+        self._pathbox_paths = path_list
+        self._pathbox_buttons = path_buttons
+
+        box.children = tuple([home_button] + path_buttons)
 
     def _update_body_box(self, body_box=None):
         if body_box is None:
@@ -20,8 +20,8 @@ __date__ = "Feb 02, 2021"
 class _BusyCheck:
     def __init__(self):
         self._busy = False
-        self._widget_state = {}
-        self.widgets_to_deactivate = tuple([widgets.Button])
+        self._widget_state = []
+        self.widgets_to_deactivate = (widgets.Button,)
 
     @property
     def busy(self):
@@ -30,14 +30,17 @@ class _BusyCheck:
     @busy.setter
     def busy(self, value):
         if value:
-            for key, val in self._widgets.items():
-                if isinstance(val, self.widgets_to_deactivate):
-                    self._widget_state[key] = val.disabled
-                    val.disabled = True
+            self._widget_state = [
+                (widget, widget.disabled)
+                for widget in self._widgets.values()
+                if isinstance(widget, self.widgets_to_deactivate)
+            ]
+            for widget, _ in self._widget_state:
+                widget.disabled = True
         else:
-            wid = self._widgets
-            for key, val in self._widget_state.items():
-                wid[key].disabled = val
+            for widget, disabled in self._widget_state:
+                widget.disabled = disabled
+            self._widget_state = []
         self._busy = value
 
     @property
@@ -73,21 +76,26 @@ def clickable(function):
 
     This decorator extends the signature of the function with one or no positional argument by one
     additional positional argument (the button) which is discarded."""
-    signature = inspect.getfullargspec(function)
-    if len(signature.args) > 1:
+    code = getattr(function, "__code__", None)
+    if code is not None:
+        n_args = code.co_argcount
+        has_var_args = code.co_flags & (inspect.CO_VARARGS | inspect.CO_VARKEYWORDS)
+        has_defaults = function.__defaults__ is not None
+    else:
+        signature = inspect.getfullargspec(function)
+        n_args = len(signature.args)
+        has_var_args = signature.varkw is not None or signature.varargs is not None
+        has_defaults = signature.defaults is not None
+    if n_args > 1:
         raise ValueError(
             "Only functions with up to one positional argument are supported."
         )
-    if not (
-        signature.varkw is None
-        and signature.varargs is None
-        and signature.defaults is None
-    ):
+    if has_var_args or has_defaults:
         raise ValueError(
             "Function not supported, defines positional argument defaults or has *args or **kwargs."
         )
 
-    if len(signature.args) == 1:
+    if n_args == 1:
 
         @functools.wraps(function)
         def decorated(self, button=None, **kwargs):
@@ -2,10 +2,13 @@
 # Copyright (c) Max-Planck-Institut für Eisenforschung GmbH - Computational Materials Design (CM) Department
 # Distributed under the terms of "New BSD License", see the LICENSE file.
 
+import asyncio
+import traceback
+from functools import partial
+
 import ipywidgets as widgets
 import numpy as np
 from IPython.core.display import display
-from matplotlib import pyplot as plt
 
 __author__ = "Niklas Siemer"
 __copyright__ = (
@@ -19,32 +22,77 @@ __status__ = "development"
 __date__ = "Sep 30, 2021"
 
 
+def _show_in_output(output, obj):
+    """Replace the content of the output widget by obj."""
+    with output:
+        # wait=True keeps the old content until the new one is displayed, i.e. no blank frame in between
+        output.clear_output(wait=True)
+        display(obj)
+
+
 class ObjectWidget:
     def __init__(self, obj):
         self._obj = obj
         self._output = widgets.Output()
         self._box = widgets.VBox()
+        self._initialized = False
 
     def refresh(self):
         self._output.clear_output()
         with self._output:
             print(" ")
             # display(self._obj)
-        self._box.children = tuple([self._output])
+        self._box.children = (self._output,)
 
     @property
     def gui(self):
-        self.refresh()
+        """The widget box; its content is only rendered on first access (or by an explicit refresh)."""
+        if not self._initialized:
+            self.refresh()
+            self._initialized = True
         return self._box
 
     def _ipython_display_(self):
         display(self.gui)
 
+    def _observe_option_widgets(self):
+        """Keep self._options in sync with the values of the corresponding self._option_widgets."""
+        for key in self._options:
+            self._option_widgets[key].observe(
+                partial(self._set_option, key), names="value"
+            )
+
+    def _set_option(self, key, change):
+        self._options[key] = change["new"]
+
 
 class AtomsWidget(ObjectWidget):
+    _VIEW_PLANE_Z = np.array([0, 0, 1], dtype=np.float64)
+    # plot3d arguments which do not depend on the option widgets
+    _PLOT3D_DEFAULTS = {
+        "mode": "NGLview",
+        "spacefill": True,
+        "select_atoms": None,
+        "background": "white",
+        "color_scheme": None,
+        "colors": None,
+        "scalar_field": None,
+        "scalar_start": None,
+        "scalar_end": None,
+        "scalar_cmap": None,
+        "vector_field": None,
+        "vector_color": None,
+        "magnetic_moments": False,
+        "view_plane": _VIEW_PLANE_Z,
+        "distance_from_camera": 1.0,
+        "opacity": 1.0,
+    }
+
     def __init__(self, atoms_object):
         super().__init__(atoms_object)
         self._ngl_widget = None
+        self._last_rendered_options = None
+        self._render_scheduled = False
         self._apply_button = widgets.Button(description="Apply")
         self._apply_button.on_click(self._on_click_apply_button)
         self._header = widgets.HBox()
@@ -56,23 +104,50 @@ class AtomsWidget(ObjectWidget):
             "cell": True,
         }
         self._init_option_widgets()
+        self._header.children = (self._option_representation, self._apply_button)
 
     def _on_click_apply_button(self, b):
         self.refresh()
 
     def refresh(self):
-        self._update_header()
         self._update_box()
 
-    def _update_header(self):
-        self._header.children = tuple([self._option_representation, self._apply_button])
-
     def _update_box(self):
+        """Show the structure; a re-render within an event loop is deferred while the previous view stays visible."""
+        if not self._ngl_widget_outdated:
+            self._render()
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._render()
+            return
+        if self._render_scheduled:
+            return
+        self._render_scheduled = True
+        if self._ngl_widget is None:
+            self._show_in_box(widgets.HTML("<i>Loading...</i>"))
+        loop.call_soon(self._deferred_render)
+
+    def _deferred_render(self):
+        """Render scheduled on the event loop; there is no caller to raise to, thus errors are shown in the output."""
+        try:
+            self._render()
+        except Exception:
+            self._render_scheduled = False
+            self._output.clear_output()
+            with self._output:
+                traceback.print_exc()
+
+    def _render(self):
+        self._render_scheduled = False
         self._update_ngl_widget()
-        self._output.clear_output()
-        with self._output:
-            display(self._ngl_widget)
-        self._box.children = tuple([self._header, self._output])
+        self._show_in_box(self._ngl_widget)
+
+    def _show_in_box(self, widget):
+        with self._box.hold_sync():
+            _show_in_output(self._output, widget)
+            self._box.children = (self._header, self._output)
 
     def _init_option_widgets(self):
         self._option_widgets = {
@@ -110,54 +185,57 @@ class AtomsWidget(ObjectWidget):
                 description_tooltip="Reset view if checked",
             ),
         }
+        self._observe_option_widgets()
+        widget_list = list(self._option_widgets.values())
+        self._option_box = widgets.VBox(
+            [widgets.HBox(widget_list[0:2]), widgets.HBox(widget_list[2:])]
+        )
 
     @property
     def _option_representation(self):
         """ipywidet to change the options for the self_representation"""
-        widget_list = list(self._option_widgets.values())
-        return widgets.VBox(
-            [widgets.HBox(widget_list[0:2]), widgets.HBox(widget_list[2:])]
-        )
+        return self._option_box
 
-    def _parse_option_widgets(self):
-        for key in self._options.keys():
-            self._options[key] = self._option_widgets[key].value
+    @property
+    def _ngl_widget_outdated(self):
+        return (
+            self._ngl_widget is None
+            or self._options["reset_view"]
+            or self._options != self._last_rendered_options
+        )
 
     def _update_ngl_widget(self):
-        self._parse_option_widgets()
+        if not self._ngl_widget_outdated:
+            # Nothing changed; the present widget (and its camera orientation) is kept.
+            return
         if self._ngl_widget is not None:
             orient = self._ngl_widget.get_state()["_camera_orientation"]
         else:
             orient = []
 
-        self._ngl_widget = self._obj.plot3d(
-            mode="NGLview",
+        # The new widget is completely set up before it replaces the displayed one.
+        ngl_widget = self._obj.plot3d(
+            **self._PLOT3D_DEFAULTS,
             show_cell=self._options["cell"],
             show_axes=self._options["axes"],
             camera=self._options["camera"],
-            spacefill=True,
             particle_size=self._options["particle_size"],
-            select_atoms=None,
-            background="white",
-            color_scheme=None,
-            colors=None,
-            scalar_field=None,
-            scalar_start=None,
-            scalar_end=None,
-            scalar_cmap=None,
-            vector_field=None,
-            vector_color=None,
-            magnetic_moments=False,
-            view_plane=np.array([0, 0, 1]),
-            distance_from_camera=1.0,
-            opacity=1.0,
         )
         if not self._options["reset_view"] and len(orient) == 16:
             # len(orient)=16 if set; c.f. pyiron_atomistics.atomistics.structure._visualize._get_flattened_orientation
-            self._ngl_widget.control.orient(orient)
+            ngl_widget.control.orient(orient)
+        self._ngl_widget = ngl_widget
+        self._last_rendered_options = dict(self._options)
 
 
 class MurnaghanWidget(ObjectWidget):
+    # Methods of the Murnaghan job for the fit types with a dedicated fit function
+    _FIT_METHODS = {
+        "birchmurnaghan": "fit_birch_murnaghan",
+        "murnaghan": "fit_murnaghan",
+        "vinet": "fit_vinet",
+    }
+
     def __init__(self, murnaghan_object):
         super().__init__(murnaghan_object)
         self._option_widgets = None
@@ -168,18 +246,18 @@ class MurnaghanWidget(ObjectWidget):
             "fit_type": self._obj.input["fit_type"],
             "fit_order": 3,  # self._murnaghan_object.input['fit_order']
         }
+        self._last_fit = None
+        self._figure_cache = {}
+        self._shown_fit_dict = None
         self._init_option_widgets()
+        self._header.children = (self._option_representation, self._apply_button)
 
     def _on_click_apply_button(self, b):
         self.refresh()
 
     def refresh(self):
-        self._update_header()
         self._update_box()
 
-    def _update_header(self):
-        self._header.children = tuple([self._option_representation, self._apply_button])
-
     def _init_option_widgets(self):
         self._option_widgets = {
             "fit_type": widgets.Dropdown(
@@ -208,6 +286,10 @@ class MurnaghanWidget(ObjectWidget):
         self._option_widgets["fit_type"].observe(
             self._on_change_fit_type, names="value"
         )
+        self._observe_option_widgets()
+        self._option_box = widgets.VBox(
+            [self._option_widgets["fit_type"], self._option_widgets["fit_order"]]
+        )
 
     def _on_change_fit_type(self, change):
         if change["new"] != "polynomial":
@@ -220,43 +302,69 @@ class MurnaghanWidget(ObjectWidget):
     @property
     def _option_representation(self):
         """ipywidet to change the options for the self_representation"""
-        return widgets.VBox(
-            [self._option_widgets["fit_type"], self._option_widgets["fit_order"]]
-        )
-
-    def _parse_option_widgets(self):
-        for key in self._options.keys():
-            self._options[key] = self._option_widgets[key].value
+        return self._option_box
 
     def _update_box(self):
+        with self._box.hold_sync():
+            self._update_output()
+            self._box.children = (self._header, self._output)
+
+    def _update_output(self):
         self._output.clear_output()
         with self._output:
-            plt.ioff()
-            self._parse_option_widgets()
+            from matplotlib import pyplot as plt
 
-            if self._options["fit_type"] == "polynomial" and (
-                self._obj.input["fit_type"] != "polynomial"
-                or self._obj.input["fit_order"] != self._options["fit_order"]
-            ):
-                self._obj.fit_polynomial(fit_order=self._options["fit_order"])
-            elif self._options["fit_type"] == "birchmurnaghan" and (
-                self._obj.input["fit_type"] != self._options["fit_type"]
-            ):
-                self._obj.fit_birch_murnaghan()
-            elif self._options["fit_type"] == "murnaghan" and (
-                self._obj.input["fit_type"] != self._options["fit_type"]
-            ):
-                self._obj.fit_murnaghan()
-            elif self._options["fit_type"] == "vinet" and (
-                self._obj.input["fit_type"] != self._options["fit_type"]
-            ):
-                self._obj.fit_vinet()
-            elif self._obj.input["fit_type"] != self._options["fit_type"]:
-                self._obj._fit_eos_general(fittype=self._options["fit_type"])
+            if plt.isinteractive():
+                plt.ioff()
 
-            self._obj.plot()
+            fit_type = self._options["fit_type"]
+            fit_key = (
+                fit_type,
+                self._options["fit_order"] if fit_type == "polynomial" else None,
+            )
+            if self._obj.fit_dict is not self._shown_fit_dict:
+                # The job got fitted outside of the widget, thus the cached plots may be outdated.
+                self._figure_cache.clear()
+                self._last_fit = None
+            figure = self._figure_cache.get(fit_key)
+            if figure is None:
+                if fit_key != self._last_fit:
+                    self._fit()
+                    self._last_fit = fit_key
+                figure, ax = plt.subplots()
+                plt.close(figure)
+                self._obj.plot(ax=ax)
+                if self._fit_matches(fit_key):
+                    self._figure_cache[fit_key] = figure
+                self._shown_fit_dict = self._obj.fit_dict
+            display(figure)
+
+    def _fit_matches(self, fit_key):
+        """Check if the current fit of the wrapped object was done with the options in fit_key."""
+        fit_dict = self._obj.fit_dict
+        if not fit_dict:
+            return False
+        fit_type, fit_order = fit_key
+        return fit_dict.get("fit_type") == fit_type and (
+            fit_order is None or fit_dict.get("fit_order") == fit_order
+        )
 
-        self._box.children = tuple([self._header, self._output])
+    def _fit(self):
+        """Fit the energy-volume curve according to the options, if not already done by the wrapped object."""
+        fit_type = self._options["fit_type"]
+        fit_input = self._obj.input
+        if fit_type == "polynomial":
+            if (
+                fit_input["fit_type"] != "polynomial"
+                or fit_input["fit_order"] != self._options["fit_order"]
+            ):
+                self._obj.fit_polynomial(fit_order=self._options["fit_order"])
+        elif fit_input["fit_type"] != fit_type:
+            fit_method = self._FIT_METHODS.get(fit_type)
+            if fit_method is not None:
+                getattr(self._obj, fit_method)()
+            else:
+                self._obj._fit_eos_general(fittype=fit_type)
 
 
 class NumpyWidget(ObjectWidget):
@@ -264,25 +372,28 @@ class NumpyWidget(ObjectWidget):
         super().__init__(numpy_array)
         self._fig = None
         self._ax = None
+        self._canvas_displayed = False
         self._plot_options = None
+        self._plot_slice = None
+        self._plot_header = None
         self._init_plot_option_widgets()
 
         self._header = widgets.HBox()
 
-        self._show_plot_button = widgets.Button(description="Show plot")
+        self._show_plot_button = widgets.Button(
+            description="Show plot", tooltip="Show plot representation"
+        )
         self._show_plot_button.on_click(self._click_replot_button)
-        self._show_plot_button.tooltip = "Show plot representation"
 
-        self._replot_button = widgets.Button()
-        if self._obj.ndim < 3:
-            self._replot_button.description = "Replot"
-        else:
-            self._replot_button.description = "Apply"
+        self._replot_button = widgets.Button(
+            description="Replot" if self._obj.ndim < 3 else "Apply"
+        )
         self._replot_button.on_click(self._click_replot_button)
 
-        self._show_data_button = widgets.Button(description="Show data")
+        self._show_data_button = widgets.Button(
+            description="Show data", tooltip="Show data representation"
+        )
         self._show_data_button.on_click(self._click_show_data_button)
-        self._show_data_button.tooltip = "Show data representation"
 
         self._plot_array()
         self._show_plot()
@@ -291,10 +402,9 @@ class NumpyWidget(ObjectWidget):
         self._show_data_only()
 
     def _show_data_only(self):
-        self._header.children = tuple([self._show_plot_button])
-        self._output.clear_output()
-        with self._output:
-            display(self._obj)
+        self._header.children = (self._show_plot_button,)
+        self._canvas_displayed = False
+        _show_in_output(self._output, self._obj)
         self.refresh()
 
     def _click_replot_button(self, b):
@@ -302,32 +412,30 @@ class NumpyWidget(ObjectWidget):
         self._show_plot()
 
     def _show_plot(self):
-        if self._obj.ndim >= 3:
-            self._header.children = tuple(
-                [
+        if self._plot_header is None:
+            if self._obj.ndim >= 3:
+                self._plot_header = (
                     self._option_representation,
                     widgets.VBox([self._show_data_button, self._replot_button]),
-                ]
-            )
-        else:
-            self._header.children = tuple(
-                [widgets.HBox([self._show_data_button, self._replot_button])]
-            )
+                )
+            else:
+                self._plot_header = (
+                    widgets.HBox([self._show_data_button, self._replot_button]),
+                )
+        self._header.children = self._plot_header
         self.refresh()
 
     def refresh(self):
-        self._box.children = tuple([self._header, self._output])
+        self._box.children = (self._header, self._output)
 
     @property
     def _option_representation(self):
         """Return ipywidget.Vbox to change plot options"""
         box = widgets.VBox()
         if self._obj.ndim >= 3:
-            box.children = tuple(
-                [
-                    widgets.HBox([self._plot_options["dim"]]),
-                    widgets.HBox(self._plot_options["idx"]),
-                ]
+            box.children = (
+                widgets.HBox([self._plot_options["dim"]]),
+                widgets.HBox(self._plot_options["idx"]),
             )
         return box
 
@@ -357,51 +465,72 @@ class NumpyWidget(ObjectWidget):
                 )
             )
         if numpy_array.ndim == 3:
-            fixed_idx_list[0].description = "Fixed index"
-            fixed_idx_list[0].description_tooltip = (
-                f"Fixed index of the not chosen dimension; the shape of the "
-                f"array is {shape}"
-            )
+            with fixed_idx_list[0].hold_sync():
+                fixed_idx_list[0].description = "Fixed index"
+                fixed_idx_list[0].description_tooltip = (
+                    f"Fixed index of the not chosen dimension; the shape of the "
+                    f"array is {shape}"
+                )
 
         self._plot_options = {"dim": dim_widget, "idx": fixed_idx_list}
+        dim_widget.observe(self._update_plot_slice, names="value")
+        for idx_widget in fixed_idx_list:
+            idx_widget.observe(self._update_plot_slice, names="value")
+        self._update_plot_slice()
+
+    def _update_plot_slice(self, change=None):
+        """Build the index selecting the plotted 2D slice from the plot option widgets (None if invalid)."""
+        dims = self._plot_options["dim"].value
+        if len(dims) != 2:
+            self._plot_slice = None
+            return
+        fixed_idx = iter([idx_widget.value for idx_widget in self._plot_options["idx"]])
+        self._plot_slice = tuple(
+            slice(None) if dim in dims else next(fixed_idx)
+            for dim in range(self._obj.ndim)
+        )
 
     def _plot_array(self):
-        plt.ioff()
+        from matplotlib import pyplot as plt
+
+        if plt.isinteractive():
+            plt.ioff()
         val = self._obj
         if self._fig is None:
             self._fig, self._ax = plt.subplots()
-        else:
-            self._ax.clear()
 
         if val.ndim == 1:
-            self._ax.plot(val)
+            self._plot_data(val)
         elif val.ndim == 2:
-            if len(val) == 1:
-                self._ax.plot(val[0])
-            else:
-                self._ax.plot(val)
-        elif self._plot_options is None:
-            slc = [0 for _ in range(val.ndim)]
-            slc[0] = slice(None)
-            slc[1] = slice(None)
-            self._ax.plot(val[tuple(slc)])
+            self._plot_data(val.T if val.shape[0] == 1 else val)
+        elif self._plot_slice is None:
+            print("Error: You need to select exactly two dimensions.")
+            return
         else:
-            if len(self._plot_options["dim"].value) != 2:
-                print(f"Error: You need to select exactly two dimensions.")
-                return
-            slc = [None for i in range(val.ndim)]
-            i = 0
-            for index in range(val.ndim):
-                if index in self._plot_options["dim"].value:
-                    slc[index] = slice(None)
-                else:
-                    slc[index] = self._plot_options["idx"][i].value
-                    i += 1
-            self._ax.plot(val[tuple(slc)])
+            # Basic indexing with the prebuilt slice tuple returns a view, no data is copied.
+            self._plot_data(val[self._plot_slice])
 
         self._ax.relim()
         self._ax.autoscale_view()
 
-        self._output.clear_output()
-        with self._output:
-            display(self._ax.figure)
+        if isinstance(self._fig.canvas, widgets.DOMWidget):
+            # Interactive backend (ipympl): display the canvas once and redraw it in place.
+            if not self._canvas_displayed:
+                _show_in_output(self._output, self._fig.canvas)
+                self._canvas_displayed = True
+            self._fig.canvas.draw_idle()
+        else:
+            _show_in_output(self._output, self._ax.figure)
+
+    def _plot_data(self, data):
+        """Plot the columns of data, updating the present lines in place if the shape did not change."""
+        ydata = data.reshape(len(data), -1).T
+        lines = self._ax.lines
+        if len(lines) == len(ydata) and all(
+            len(line.get_ydata()) == ydata.shape[1] for line in lines
+        ):
+            for line, y in zip(lines, ydata):
+                line.set_ydata(y)
+        else:
+            self._ax.clear()
+            self._ax.plot(data)
@@ -4,10 +4,9 @@
 
 import os
 import posixpath
-from functools import singledispatch
+from types import BuiltinMethodType, MappingProxyType, MethodType
+from typing import get_type_hints
 
-from pyiron_atomistics import Atoms
-from pyiron_atomistics.atomistics.master.murnaghan import Murnaghan
 from pyiron_base import HasGroups
 from pyiron_gui.wrapper.widgets import ObjectWidget, AtomsWidget, MurnaghanWidget
 
@@ -23,29 +22,83 @@ __status__ = "development"
 __date__ = "Sep 30, 2021"
 
 
-@singledispatch
-def PyironWrapper(py_obj, project, rel_path=""):
-    return BaseWrapper(py_obj, project, rel_path=rel_path)
+_WRAPPER_TABLE = {}
+_wrapper_class_cache = {}
+
+
+def register(cls, wrapper=None):
+    """Register the wrapper class used by :func:`PyironWrapper` for objects of type cls (and its subclasses).
+
+    cls may also be given by its full import path, e.g. "package.module.Class", such that it does not have to be
+    imported for the registration. As for the former singledispatch based `PyironWrapper.register`, any callable
+    with the signature (py_obj, project, rel_path="") may serve as wrapper, and register can be used as decorator,
+    i.e. `@register(cls)` or `@register` on a function with an annotated first argument.
+    """
+    if wrapper is None:
+        if isinstance(cls, (type, str)):
+            return lambda func: register(cls, func)
+        func = cls
+        argname, cls = next(iter(get_type_hints(func).items()))
+        return register(cls, func)
+    _WRAPPER_TABLE[cls] = wrapper
+    _wrapper_class_cache.clear()
+    return wrapper
+
+
+def _wrapper_class(obj_type):
+    """Return the wrapper class for obj_type; the MRO is only searched once per type."""
+    try:
+        return _wrapper_class_cache[obj_type]
+    except KeyError:
+        pass
+    wrapper = BaseWrapper
+    for base in obj_type.__mro__:
+        if base in _WRAPPER_TABLE:
+            wrapper = _WRAPPER_TABLE[base]
+            break
+        import_path = f"{base.__module__}.{base.__qualname__}"
+        if import_path in _WRAPPER_TABLE:
+            wrapper = _WRAPPER_TABLE[import_path]
+            break
+    _wrapper_class_cache[obj_type] = wrapper
+    return wrapper
+
+
+def has_wrapper(py_obj):
+    """True if a specialized wrapper is registered for the type of py_obj."""
+    return _wrapper_class(type(py_obj)) is not BaseWrapper
 
 
-@PyironWrapper.register
-def _(py_obj: Atoms, project, rel_path=""):
-    return AtomsWrapper(py_obj, project, rel_path=rel_path)
+def PyironWrapper(py_obj, project, rel_path=""):
+    return _wrapper_class(type(py_obj))(py_obj, project, rel_path=rel_path)
 
 
-@PyironWrapper.register
-def _(py_obj: Murnaghan, project, rel_path=""):
-    return MurnaghanWrapper(py_obj, project, rel_path=rel_path)
+# Keep the interface of the former singledispatch function
+PyironWrapper.register = register
+PyironWrapper.registry = MappingProxyType(_WRAPPER_TABLE)
+PyironWrapper.dispatch = _wrapper_class
 
 
 class BaseWrapper(HasGroups):
     """Simple wrapper for pyiron objects which extends for basic pyiron functionality (list_nodes ...)"""
 
+    _widget_class = ObjectWidget
+
     def __init__(self, pyi_obj, project, rel_path=""):
         self._wrapped_object = pyi_obj
         self._project = project
         self._rel_path = rel_path
         self._name = None
+        self._widget = None
+        self._method_cache = {}
+        self._has_project = hasattr(pyi_obj, "project")
+        self._has_path = hasattr(pyi_obj, "path")
+        self._has_list_nodes = hasattr(pyi_obj, "list_nodes")
+        self._has_list_groups = hasattr(pyi_obj, "list_groups")
+        project_path = getattr(project, "path", None)
+        self._project_path_prefix = (
+            None if project_path is None else project_path.rstrip("/") + "/"
+        )
 
     @property
     def name(self):
@@ -53,13 +106,13 @@ class BaseWrapper(HasGroups):
 
     @property
     def project(self):
-        if hasattr(self._wrapped_object, "project"):
+        if self._has_project:
             return self._wrapped_object.project
         return self._project
 
     @property
     def path(self):
-        if hasattr(self._wrapped_object, "path"):
+        if self._has_path:
             return self._wrapped_object.path
         if hasattr(self.project, "path"):
             return posixpath.join(self.project.path, self._rel_path)
@@ -69,29 +122,48 @@ class BaseWrapper(HasGroups):
         try:
             return self._wrapped_object[item]
         except (IndexError, KeyError, TypeError):
-            rel_path = os.path.relpath(
-                posixpath.join(self.path, item), self._project.path
-            )
+            rel_path = self._rel_path_in_project(item)
             if rel_path == ".":
                 return self._project
             return self._project[rel_path]
 
+    def _rel_path_in_project(self, item):
+        """Path of item relative to the project; plain names skip os.path.relpath."""
+        own_path = self.path
+        path = own_path + "/"
+        prefix = self._project_path_prefix
+        if (
+            prefix is not None
+            and isinstance(item, str)
+            and path.startswith(prefix)
+            and all(part not in ("", ".", "..") for part in item.split("/"))
+        ):
+            rel_dir = path[len(prefix) :].strip("/")
+            return rel_dir + "/" + item if rel_dir else item
+        return os.path.relpath(posixpath.join(own_path, item), self._project.path)
+
     def __getattr__(self, item):
-        if item in ["list_nodes", "list_groups"]:
-            try:
-                return getattr(self._wrapped_object, item)
-            except AttributeError:
-                return self._empty_list
-        return getattr(self._wrapped_object, item)
+        method_cache = self.__dict__.get("_method_cache")
+        if method_cache is not None and item in method_cache:
+            return method_cache[item]
+        value = getattr(self._wrapped_object, item)
+        # Only methods bound to the wrapped object are cached, other attributes may change.
+        if (
+            method_cache is not None
+            and isinstance(value, (MethodType, BuiltinMethodType))
+            and value.__self__ is self._wrapped_object
+        ):
+            method_cache[item] = value
+        return value
 
     def _list_groups(self):
-        if hasattr(self._wrapped_object, "list_groups"):
+        if self._has_list_groups:
             return self._wrapped_object.list_groups()
         else:
             return []
 
     def _list_nodes(self):
-        if hasattr(self._wrapped_object, "list_nodes"):
+        if self._has_list_nodes:
             return self._wrapped_object.list_nodes()
         else:
             return []
@@ -101,24 +173,26 @@ class BaseWrapper(HasGroups):
 
     @property
     def gui(self):
-        return ObjectWidget(self).gui
+        if self._widget is None:
+            self._widget = self._widget_class(self)
+        return self._widget.gui
 
 
 class AtomsWrapper(BaseWrapper):
+    _widget_class = AtomsWidget
+
     def __init__(self, pyi_obj, project, rel_path=""):
         super().__init__(pyi_obj, project, rel_path=rel_path)
         self._name = "structure"
 
-    @property
-    def gui(self):
-        return AtomsWidget(self).gui
-
 
 class MurnaghanWrapper(BaseWrapper):
+    _widget_class = MurnaghanWidget
+
     def __init__(self, pyi_obj, project, rel_path=""):
         super().__init__(pyi_obj, project, rel_path=rel_path)
         self._name = "murnaghan"
 
-    @property
-    def gui(self):
-        return MurnaghanWidget(self).gui
+
+register("pyiron_atomistics.atomistics.structure.atoms.Atoms", AtomsWrapper)
+register("pyiron_atomistics.atomistics.master.murnaghan.Murnaghan", MurnaghanWrapper)
@@ -2,7 +2,10 @@
 # Copyright (c) Max-Planck-Institut für Eisenforschung GmbH - Computational Materials Design (CM) Department
 # Distributed under the terms of "New BSD License", see the LICENSE file.
 
+import asyncio
+import os
 import unittest
+import unittest.mock
 from os import remove
 from os.path import join
 
@@ -170,6 +173,76 @@ class TestHasGroupsBrowser(unittest.TestCase):
             self.assertEqual(self.browser._clicked_nodes, [])
             self.assertIsNone(self.browser.data)
 
+    def test__update_body_box(self):
+        self.browser._update_body_box()
+        children = self.browser._body_box.children
+        group_buttons = self.browser._group_box.children
+        self.browser._update_body_box()
+        self.assertEqual(self.browser._body_box.children, children)
+        self.assertEqual(self.browser._group_box.children, group_buttons,
+                         msg="An unchanged listing should result in the same buttons.")
+
+    def test__update_node_button_colors(self):
+        self.browser.refresh()
+        body_children = self.browser._body_box.children
+        buttons = {button.description: button for button in self.browser._gen_node_buttons()}
+        self.browser._on_click_node(widgets.Button(description='A'))
+        self.assertEqual(buttons['A'].style.button_color, self.browser.color['file_chosen'])
+        self.assertEqual(buttons['D'].style.button_color, self.browser.color['file'])
+        self.browser._on_click_node(widgets.Button(description='D'))
+        self.assertEqual(buttons['A'].style.button_color, self.browser.color['file'])
+        self.assertEqual(buttons['D'].style.button_color, self.browser.color['file_chosen'])
+        self.assertIs(self.browser._body_box.children, body_children,
+                      msg="Clicking a node should only recolor buttons and not rebuild the body box.")
+
+    def test__batch_refresh(self):
+        with unittest.mock.patch.object(self.browser, '_gen_box_children', return_value=[]) as gen_children:
+            with self.browser._batch_refresh():
+                self.browser.refresh()
+                with self.browser._batch_refresh():
+                    self.browser.refresh()
+                self.assertEqual(gen_children.call_count, 0, msg="Refresh should be deferred inside the context.")
+                self.browser.refresh()
+            self.assertEqual(gen_children.call_count, 1, msg="Pending refreshes should collapse into one.")
+
+            with self.browser._batch_refresh():
+                pass
+            self.assertEqual(gen_children.call_count, 1, msg="No refresh requested, thus none expected.")
+
+    def test__gen_group_buttons(self):
+        buttons = self.browser._gen_group_buttons()
+        self.assertEqual([button.description for button in buttons], ['B', 'C', 'E'])
+        self.browser._on_click_group(widgets.Button(description='B'))
+        new_buttons = self.browser._gen_group_buttons()
+        self.assertEqual([button.description for button in new_buttons], ['B1', 'B2'])
+        self.assertIs(new_buttons[0], buttons[0], msg="Buttons should be reused from the pool.")
+        self.assertIs(new_buttons[1], buttons[1], msg="Buttons should be reused from the pool.")
+
+    def test__schedule_navigation(self):
+        calls = []
+        self.browser._schedule_navigation(lambda: calls.append(1))
+        self.assertEqual(calls, [1], msg="Without an event loop the navigation should run immediately.")
+
+        async def click_three_times():
+            for i in range(2, 5):
+                self.browser._schedule_navigation(lambda i=i: calls.append(i))
+            self.assertEqual(calls, [1], msg="Navigation should be deferred inside an event loop.")
+            await asyncio.sleep(0)
+
+        asyncio.run(click_three_times())
+        self.assertEqual(calls, [1, 4], msg="Only the last of several pending navigations should run.")
+
+    def test__show_more(self):
+        self.browser._page_size = 2
+        self.browser._n_shown = 2
+        buttons = self.browser._gen_group_buttons()
+        self.assertEqual([button.description for button in buttons], ['B', 'C', 'Show more'])
+        self.browser._show_more()
+        buttons = self.browser._gen_group_buttons()
+        self.assertEqual([button.description for button in buttons], ['B', 'C', 'E'])
+        self.browser._on_click_group(widgets.Button(description='B'))
+        self.assertEqual(self.browser._n_shown, 2, msg="A new project should start with one page again.")
+
     def test_copy(self):
         self.test__on_click_group_B()
         cp = self.browser.copy()
@@ -240,6 +313,12 @@ class TestHasGroupsBrowserWithHistoryPath(unittest.TestCase):
     def setUp(self):
         self.browser = HasGroupsBrowserWithHistoryPath(self.data_container)
 
+    def test__update_project_single_refresh(self):
+        with unittest.mock.patch.object(self.browser, '_gen_box_children', return_value=[]) as gen_children:
+            self.browser._on_click_group(widgets.Button(description='B'))
+        self.assertEqual(gen_children.call_count, 1, msg="A group click should refresh the browser once.")
+        self.assertEqual(self.browser.path_list, ['/', 'B'])
+
     def test_navigation(self):
         self.browser._on_click_group(widgets.Button(description='B'))
         self.browser._on_click_group(widgets.Button(description='B1'))
@@ -332,6 +411,38 @@ class TestHasGroupsBrowserWithOutput(TestWithProject):
             browser._select_node('NotAFileName.dat')
             self.assertIsNone(browser.data, msg=f"Expected browser.data to be None, but got {browser.data}")
             
+    def test__on_click_node_in_event_loop(self):
+        browser = self.browser.copy()
+
+        async def click(node):
+            browser._on_click_node(widgets.Button(description=node))
+
+        asyncio.run(click('text.txt'))
+        self.assertEqual(browser._clicked_nodes, ['text.txt'])
+        self.assertEqual(browser.data, ["some text"], msg="The node should be read on the kernel thread.")
+
+        asyncio.run(click('NotAFileName.dat'))
+        self.assertEqual(browser._clicked_nodes, [])
+        self.assertIsNone(browser.data)
+
+    def test__to_object(self):
+        hdf = self.project.create_hdf(self.project.path, 'to_object_hdf')
+        DataContainer({'a': 1}).to_hdf(hdf, 'dc')
+        obj = self.browser._to_object(hdf['dc'])
+        self.assertEqual(obj['a'], 1)
+        self.assertIs(self.browser._to_object(hdf['dc']), obj, msg="Unchanged objects should not be loaded again.")
+        DataContainer({'a': 2}).to_hdf(hdf, 'dc')
+        mtime = os.stat(hdf.file_name).st_mtime_ns + 10**9
+        os.utime(hdf.file_name, ns=(mtime, mtime))  # the timestamp resolution may be coarser than this test
+        self.assertEqual(self.browser._to_object(hdf['dc'])['a'], 2, msg="Changed files should be loaded again.")
+        remove(hdf.file_name)
+
+    def test__to_object_job(self):
+        hdf = self.project['testjob'].project_hdf5
+        job = self.browser._to_object(hdf)
+        self.assertIsInstance(job, ToyJob)
+        self.assertIsNot(self.browser._to_object(hdf), job, msg="Jobs should not be shared between selections.")
+
     def test__update_project(self):
         browser = self.browser.copy()
         browser._update_project('testjob')
@@ -424,6 +535,20 @@ class TestProjectBrowser(TestWithProject):
         self.assertTrue('test_hdf.h5' in browser.files)
         self.assertTrue('text.txt' in browser.files)
 
+    def test_invalidate(self):
+        browser = self.browser.copy()
+        browser.show_files = True
+        self.assertEqual(browser.files, ['text.txt'])
+        new_file = join(self.project.path, 'new_text.txt')
+        with open(new_file, 'w') as f:
+            f.write('some more text')
+        try:
+            self.assertEqual(browser.files, ['text.txt'], msg="Listing of the project should be cached.")
+            browser.invalidate()
+            self.assertEqual(sorted(browser.files), ['new_text.txt', 'text.txt'])
+        finally:
+            remove(new_file)
+
     def test_nodes(self):
         self.assertEqual(self.browser.nodes, ['testjob'])
 
@@ -497,7 +622,12 @@ class TestProjectBrowser(TestWithProject):
         self.assertIs(browser.project, self.project)
 
     def test_gui(self):
-        self.browser.gui()
+        browser = ProjectBrowser(project=self.project)
+        self.assertFalse(browser._widgets_built, msg="Widgets should only be constructed when shown.")
+        vbox = browser.gui()
+        self.assertTrue(browser._widgets_built)
+        self.assertIs(vbox.children[0], browser.optionbox)
+        self.assertIs(vbox.children[1], browser.pathbox)
 
     def test_box(self):
         Vbox = widgets.VBox()
@@ -505,15 +635,79 @@ class TestProjectBrowser(TestWithProject):
         self.assertTrue(self.browser.box is Vbox)
         self.assertTrue(len(self.browser.box.children) > 0)
 
+    def test_refresh_new_job(self):
+        sub = self.project.open('sub')
+        browser = ProjectBrowser(project=sub, show_files=False)
+        browser.refresh()
+        self.assertNotIn('late_job', browser.nodes)
+        job = sub.create_job(ToyJob, 'late_job')
+        job.run()
+        try:
+            browser.show_files = True
+            self.assertNotIn('late_job', browser.nodes, msg="Internal refreshes use the cached listing.")
+            browser.refresh()
+            self.assertIn('late_job', browser.nodes, msg="refresh() should reload the listing.")
+            self.assertIn('late_job', [button.description for button in browser._body_box.children])
+        finally:
+            sub.remove_job('late_job')
+
+    def test_refresh_dirty_parts(self):
+        browser = self.browser.copy()
+        browser.refresh()
+        option_buttons = browser.optionbox.children
+        browser.show_files = False
+        self.assertEqual(browser.optionbox.children, option_buttons,
+                         msg="Only the body should be rebuilt if the shown files change.")
+        browser.refresh()
+        self.assertNotEqual(browser.optionbox.children, option_buttons, msg="refresh() should rebuild all parts.")
+        browser._update_project('sub')
+        self.assertTrue(browser.path.endswith('sub/'))
+        self.assertEqual(browser.pathbox.children[-1].path, browser.path.rstrip('/'))
+        self.assertFalse(browser.optionbox.children[0].disabled, msg="Back button should be enabled after navigating.")
+
+    def test_assign_boxes(self):
+        browser = self.browser.copy()
+        pathbox, optionbox, path_string_box = widgets.HBox(), widgets.HBox(), widgets.Text()
+        browser.pathbox = pathbox
+        browser.optionbox = optionbox
+        browser.path_string_box = path_string_box
+        browser.refresh()
+        self.assertIs(browser.pathbox, pathbox)
+        self.assertIs(browser.optionbox, optionbox)
+        self.assertIs(browser.path_string_box, path_string_box)
+
     def test_fix_path(self):
         self.assertFalse(self.browser.fix_path)
         self.browser.fix_path = True
         self.assertTrue(self.browser.fix_path)
 
+    def test_refresh_in_event_loop(self):
+        browser = self.browser.copy()
+
+        async def refresh():
+            browser.refresh()
+            self.assertEqual([button.description for button in browser._body_box.children], ['sub', 'testjob'],
+                             msg="The listing should be read synchronously also within an event loop.")
+
+        asyncio.run(refresh())
+
+    def test__update_pathbox(self):
+        browser = self.browser.copy()
+        browser.refresh()
+        buttons = browser.pathbox.children
+        browser._update_project('sub')
+        new_buttons = browser.pathbox.children
+        self.assertEqual(len(new_buttons), len(buttons) + 1)
+        self.assertEqual(new_buttons[:-1], buttons, msg="Buttons of the common leading paths should be reused.")
+        self.assertEqual(new_buttons[-1].path, browser.path.rstrip('/'))
+
     def test_hide_path(self):
         self.assertTrue(self.browser.hide_path)
+        n_hidden_path_buttons = len(self.browser.pathbox.children)
         self.browser.hide_path = False
         self.assertFalse(self.browser.hide_path)
+        self.assertGreater(len(self.browser.pathbox.children), n_hidden_path_buttons,
+                           msg="Path buttons above the root path should only be created if the path is not hidden.")
 
     def test__click_option_button(self):
         reset_button = widgets.Button(description="Reset selection")
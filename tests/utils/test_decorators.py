@@ -54,6 +54,25 @@ class TestBusyCheck(unittest.TestCase):
         busy_check.busy = False
         self.assertFalse(button.disabled)
 
+    def test_widget_deactivation_existing_widgets(self):
+        button = widgets.Button(description="Button")
+        toggle = widgets.ToggleButton(description="Toggle")
+        new_busy_check = _BusyCheck()
+        new_busy_check.widgets_to_deactivate = (widgets.Button, widgets.ToggleButton)
+        new_busy_check.busy = True
+        self.assertTrue(button.disabled, msg="Widgets constructed before the busy check should be deactivated.")
+        self.assertTrue(toggle.disabled)
+        new_busy_check.busy = False
+        self.assertFalse(button.disabled)
+        self.assertFalse(toggle.disabled)
+
+    def test_widget_closed_while_busy(self):
+        button = widgets.Button(description="Button")
+        busy_check.busy = True
+        button.close()
+        busy_check.busy = False
+        self.assertEqual(busy_check._widget_state, [])
+
 
 class TestClickable(unittest.TestCase):
 
@@ -2,6 +2,7 @@
 # Copyright (c) Max-Planck-Institut für Eisenforschung GmbH - Computational Materials Design (CM) Department
 # Distributed under the terms of "New BSD License", see the LICENSE file.
 
+import asyncio
 import io
 import os
 import unittest
@@ -14,10 +15,12 @@ import numpy as np
 
 from pyiron_atomistics import Atoms
 from pyiron_atomistics.atomistics.master.murnaghan import Murnaghan
+from pyiron_base import DataContainer
 from pyiron_base._tests import TestWithProject, TestWithCleanProject
 from pyiron_gui.project.project_browser import (DisplayOutputGUI)
 from pyiron_gui.wrapper.widgets import AtomsWidget, MurnaghanWidget, NumpyWidget
-from pyiron_gui.wrapper.wrapper import PyironWrapper, BaseWrapper, AtomsWrapper, MurnaghanWrapper
+from pyiron_gui.wrapper.wrapper import (PyironWrapper, BaseWrapper, AtomsWrapper, MurnaghanWrapper, register,
+                                        has_wrapper, _WRAPPER_TABLE, _wrapper_class_cache)
 
 
 class TestPyironWrapper(TestWithProject):
@@ -34,6 +37,68 @@ class TestPyironWrapper(TestWithProject):
         murn = ref_job.create_job('Murnaghan', 'murn')
         self.assertIsInstance(PyironWrapper(murn, self.project.open('sub')), MurnaghanWrapper)
 
+    def test_register(self):
+        class Dummy:
+            pass
+
+        class SubDummy(Dummy):
+            pass
+
+        class DummyWrapper(BaseWrapper):
+            pass
+
+        self.assertFalse(has_wrapper(SubDummy()))
+        register(Dummy, DummyWrapper)
+        try:
+            self.assertIsInstance(PyironWrapper(Dummy(), self.project), DummyWrapper)
+            self.assertIsInstance(PyironWrapper(SubDummy(), self.project), DummyWrapper,
+                                  msg="Subclasses should use the wrapper of the registered base class.")
+            self.assertTrue(has_wrapper(SubDummy()))
+        finally:
+            _WRAPPER_TABLE.pop(Dummy)
+            _wrapper_class_cache.clear()
+
+    def test_register_import_path(self):
+        class Dummy:
+            pass
+
+        class DummyWrapper(BaseWrapper):
+            pass
+
+        import_path = f"{Dummy.__module__}.{Dummy.__qualname__}"
+        register(import_path, DummyWrapper)
+        try:
+            self.assertIsInstance(PyironWrapper(Dummy(), self.project), DummyWrapper)
+        finally:
+            _WRAPPER_TABLE.pop(import_path)
+            _wrapper_class_cache.clear()
+
+    def test_register_decorator(self):
+        class Dummy:
+            pass
+
+        class OtherDummy:
+            pass
+
+        @PyironWrapper.register(Dummy)
+        class DummyWrapper(BaseWrapper):
+            pass
+
+        @PyironWrapper.register
+        def _(py_obj: OtherDummy, project, rel_path=""):
+            return DummyWrapper(py_obj, project, rel_path=rel_path)
+
+        try:
+            self.assertIs(PyironWrapper.registry[Dummy], DummyWrapper)
+            self.assertIs(PyironWrapper.dispatch(Dummy), DummyWrapper)
+            self.assertIsInstance(PyironWrapper(Dummy(), self.project), DummyWrapper)
+            self.assertIsInstance(PyironWrapper(OtherDummy(), self.project), DummyWrapper,
+                                  msg="Annotated functions should be registered for the type of the first argument.")
+        finally:
+            _WRAPPER_TABLE.pop(Dummy)
+            _WRAPPER_TABLE.pop(OtherDummy)
+            _wrapper_class_cache.clear()
+
 
 class TestBaseWrapper(TestWithProject):
 
@@ -57,6 +122,12 @@ class TestBaseWrapper(TestWithProject):
 
     def test___getattr__(self):
         self.assertTrue(self.pw_str.endswith('.ext'), msg="Unknown attributes should be passed to the wrapped object.")
+        self.assertIs(self.pw_str.endswith, self.pw_str.endswith, msg="Methods of the wrapped object are cached.")
+        data = DataContainer({'a': 1})
+        pw_data = BaseWrapper(data, self.project)
+        self.assertEqual(pw_data.a, 1)
+        data.a = 2
+        self.assertEqual(pw_data.a, 2, msg="Other attributes should not be cached.")
 
     def test_name(self):
         self.assertIs(self.pw_str.name, None,
@@ -78,6 +149,10 @@ class TestBaseWrapper(TestWithProject):
 
     def test_gui(self):
         self.assertIsInstance(self.pw_str.gui, widgets.VBox)
+        self.assertIs(self.pw_str.gui, self.pw_str.gui, msg="The widget should only be created once.")
+        with unittest.mock.patch.object(self.pw_str._widget, 'refresh') as refresh:
+            _ = self.pw_str.gui
+            refresh.assert_not_called()
 
 
 class TestAtomsWrapper(TestWithProject):
@@ -134,6 +209,12 @@ class TestAtomsWidget(TestWithProject):
             widget_state_orient = plot.get_state()['_camera_orientation']
             self.pw_atoms.refresh()
             replot = self.pw_atoms._ngl_widget
+            self.assertIs(plot, replot, msg="Unchanged options should not re-create the ngl widget.")
+            self.assertEqual(widget_state_orient, replot.get_state()['_camera_orientation'])
+
+            self.pw_atoms._option_widgets['particle_size'].value = 2.0
+            self.pw_atoms.refresh()
+            replot = self.pw_atoms._ngl_widget
             self.assertFalse(plot is replot)
             self.assertEqual(widget_state_orient, replot.get_state()['_camera_orientation'])
 
@@ -141,10 +222,33 @@ class TestAtomsWidget(TestWithProject):
             self.pw_atoms.refresh()
             self.assertEqual(widget_state_orient_init, self.pw_atoms._ngl_widget.get_state()['_camera_orientation'])
 
-    def test__parse_option_widgets(self):
+    def test_refresh_in_event_loop(self):
+        async def refresh():
+            with unittest.mock.patch.object(self.pw_atoms, '_update_ngl_widget') as update_ngl_widget:
+                self.pw_atoms.refresh()
+                self.pw_atoms.refresh()
+                update_ngl_widget.assert_not_called()
+                self.assertTrue(self.pw_atoms._render_scheduled)
+                await asyncio.sleep(0)
+                update_ngl_widget.assert_called_once()
+
+        asyncio.run(refresh())
+        self.assertFalse(self.pw_atoms._render_scheduled)
+
+    def test_refresh_in_event_loop_error(self):
+        async def refresh():
+            with unittest.mock.patch.object(self.pw_atoms, '_update_ngl_widget', side_effect=ValueError("broken")):
+                self.pw_atoms.refresh()
+                with unittest.mock.patch("traceback.print_exc") as print_exc:
+                    await asyncio.sleep(0)
+                print_exc.assert_called_once()
+
+        asyncio.run(refresh())
+        self.assertFalse(self.pw_atoms._render_scheduled)
+
+    def test__observe_option_widgets(self):
         self.assertEqual(1.0, self.pw_atoms._options['particle_size'])
         self.pw_atoms._option_widgets['particle_size'].value = 2.5
-        self.pw_atoms._parse_option_widgets()
         self.assertEqual(2.5, self.pw_atoms._options['particle_size'])
 
 
@@ -224,6 +328,35 @@ class TestMurnaghanWidget(TestWithCleanProject):
         murn.status.finished = True
         self.pw_murn = MurnaghanWidget(MurnaghanWrapper(murn, self.project))
 
+    def test_repeated_apply(self):
+        with unittest.mock.patch.object(self.pw_murn, '_fit', wraps=self.pw_murn._fit) as fit:
+            self.pw_murn._on_click_apply_button("NoButtonSinceNotNeeded")
+            self.pw_murn._on_click_apply_button("NoButtonSinceNotNeeded")
+            self.assertEqual(fit.call_count, 1, msg="Unchanged options should not trigger a new fit.")
+            self.pw_murn._option_widgets['fit_type'].value = 'vinet'
+            self.pw_murn._on_click_apply_button("NoButtonSinceNotNeeded")
+            self.assertEqual(fit.call_count, 2)
+            self.pw_murn._option_widgets['fit_type'].value = 'polynomial'
+            self.pw_murn._on_click_apply_button("NoButtonSinceNotNeeded")
+            self.assertEqual(fit.call_count, 2, msg="A previous plot with the same options should be shown.")
+            self.assertEqual(self.pw_murn._obj.input['fit_type'], 'vinet', msg="Showing a cached plot should not alter the job.")
+            self.assertEqual({('polynomial', 3), ('vinet', None)}, set(self.pw_murn._figure_cache))
+
+    def test_external_fit_clears_cache(self):
+        self.pw_murn._on_click_apply_button("NoButtonSinceNotNeeded")
+        figure = self.pw_murn._figure_cache[('polynomial', 3)]
+        self.pw_murn._obj.fit_polynomial(fit_order=3)
+        self.pw_murn._on_click_apply_button("NoButtonSinceNotNeeded")
+        self.assertIsNot(self.pw_murn._figure_cache[('polynomial', 3)], figure,
+                         msg="A fit outside of the widget should invalidate the cached plots.")
+
+    def test_mismatched_fit_not_cached(self):
+        self.pw_murn._on_click_apply_button("NoButtonSinceNotNeeded")
+        self.pw_murn._option_widgets['fit_type'].value = 'vinet'
+        with unittest.mock.patch.object(self.pw_murn, '_fit'):
+            self.pw_murn._on_click_apply_button("NoButtonSinceNotNeeded")
+        self.assertNotIn(('vinet', None), self.pw_murn._figure_cache)
+
     def test_option_representation(self):
         self.assertEqual('polynomial', self.pw_murn._options['fit_type'])
         self.assertEqual(3, self.pw_murn._options['fit_order'])
@@ -388,6 +521,18 @@ class TestNumpyWidget(unittest.TestCase):
             self.assertIs(buttons[0], self.np_4d_wid._show_data_button)
             self.assertIs(buttons[1], self.np_4d_wid._replot_button)
 
+    def test__plot_slice(self):
+        wid = self.np_3d_wid
+        self.assertEqual(wid._plot_slice, (slice(None), slice(None), 0))
+        wid._plot_options['idx'][0].value = 2
+        self.assertEqual(wid._plot_slice, (slice(None), slice(None), 2))
+        wid._plot_options['dim'].value = (0, 2)
+        self.assertEqual(wid._plot_slice, (slice(None), 2, slice(None)))
+        wid._plot_array()
+        self.assertTrue(np.allclose(wid._ax.lines[0].get_ydata(), wid._obj[:, 2, 0]))
+        wid._plot_options['dim'].value = (0,)
+        self.assertIsNone(wid._plot_slice, msg="Exactly two dimensions are needed for a valid slice.")
+
     def test__plot_array(self):
         """Only testing additional/special cases here"""
         with self.subTest("2D with len=1"):
@@ -399,6 +544,13 @@ class TestNumpyWidget(unittest.TestCase):
             self.assertTrue(np.allclose(plotted_array_1d, plotted_array_2d),
                             msg="2D arrays with len=1 should behave as a 1D array")
 
+        with self.subTest("Reuse lines for same shape"):
+            lines = list(self.np_3d_wid._ax.lines)
+            self.np_3d_wid._plot_options['idx'][0].value = 1
+            self.np_3d_wid._plot_array()
+            self.assertEqual(lines, list(self.np_3d_wid._ax.lines))
+            self.assertTrue(np.allclose(self.np_3d_wid._ax.lines[0].get_ydata(), self.np_3d_wid._obj[:, 0, 1]))
+
         with self.subTest("3D without _plot_options"):
             plotted_array_init = self.np_3d_wid._ax.lines[0].get_xydata()
             self.np_3d_wid._plot_options = None
@@ -462,9 +614,13 @@ class TestDisplayOutputGUI(TestWithProject):
         self.assertEqual(type(ret).__name__, 'HTML')
 
     def test__output_conv_dict(self):
-        self.output._display_obj = {'some': "dict"}
+        self.output._display_obj = {'some': "<dict>"}
         ret = self.output._output_conv()
-        self.assertEqual(type(ret).__name__, 'DataFrame')
+        self.assertEqual(type(ret).__name__, 'HTML')
+        self.assertEqual(ret.data, "<table><tr><td>some</td><td>&lt;dict&gt;</td></tr></table>")
+        self.output._display_obj = {str(i): i for i in range(2001)}
+        ret = self.output._output_conv()
+        self.assertEqual(type(ret).__name__, 'DataFrame', msg="Large dicts are truncated by pandas.")
 
     def test__output_conv_number(self):
         self.output._debug = True
@@ -482,6 +638,10 @@ class TestDisplayOutputGUI(TestWithProject):
         ret = self.output._output_conv()
         self.assertEqual(ret, ''.join(to_long_list_of_str[:2000]) +
                          os.linesep + ' .... file too long: skipped ....')
+        self.output._display_obj = ['a' * 600000, 'b' * 600000, 'c']
+        ret = self.output._output_conv()
+        self.assertEqual(ret, 'a' * 600000 + 'b' * 400000 + os.linesep + ' .... file too long: skipped ....',
+                         msg="Long lines should be truncated to at most 10**6 characters.")
 
     def test__output_conv_list(self):
         self.output._display_obj = [1, 2, 3]